@@ -0,0 +1,68 @@
+"""
+The anchorTransformUndo command adds changes made using the Maya API to the
+undo queue. The changes are performed before the command is called, the
+command takes the undo and redo functions registered using
+:func:`anchorTransform.utils.registerUndo` and calls them when the user
+undoes or redoes the changes.
+"""
+from maya.api import OpenMaya
+
+import anchorTransform
+from anchorTransform import utils
+
+
+# ----------------------------------------------------------------------------
+
+
+def maya_useNewAPI():
+    pass
+
+
+# ----------------------------------------------------------------------------
+
+
+class AnchorTransformUndo(OpenMaya.MPxCommand):
+    def __init__(self):
+        OpenMaya.MPxCommand.__init__(self)
+        self.undo = None
+        self.redo = None
+
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def creator():
+        return AnchorTransformUndo()
+
+    # ------------------------------------------------------------------------
+
+    def doIt(self, args):
+        if not utils.UNDO_QUEUE:
+            raise RuntimeError("No changes found to add to the undo queue!")
+
+        self.undo, self.redo = utils.UNDO_QUEUE.pop(0)
+
+    def undoIt(self):
+        self.undo()
+
+    def redoIt(self):
+        self.redo()
+
+    def isUndoable(self):
+        return True
+
+
+# ----------------------------------------------------------------------------
+
+
+def initializePlugin(obj):
+    plugin = OpenMaya.MFnPlugin(
+        obj, 
+        anchorTransform.__author__, 
+        anchorTransform.__version__
+    )
+    plugin.registerCommand(utils.UNDO_PLUGIN_NAME, AnchorTransformUndo.creator)
+
+
+def uninitializePlugin(obj):
+    plugin = OpenMaya.MFnPlugin(obj)
+    plugin.deregisterCommand(utils.UNDO_PLUGIN_NAME)
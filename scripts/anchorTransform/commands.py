@@ -1,78 +1,103 @@
 from maya import cmds
-from maya.api import OpenMaya
+from maya.api import OpenMayaAnim
 from . import utils
 
 
 # ----------------------------------------------------------------------------
 
 
-TANGENTS = [
-    "auto", "clamped", "fast", 
-    "flat", "linear", "plateau", 
-    "slow", "spline", "stepnext"
-]
+TANGENTS = {
+    "auto": OpenMayaAnim.MFnAnimCurve.kTangentAuto,
+    "clamped": OpenMayaAnim.MFnAnimCurve.kTangentClamped,
+    "fast": OpenMayaAnim.MFnAnimCurve.kTangentFast,
+    "flat": OpenMayaAnim.MFnAnimCurve.kTangentFlat,
+    "linear": OpenMayaAnim.MFnAnimCurve.kTangentLinear,
+    "plateau": OpenMayaAnim.MFnAnimCurve.kTangentPlateau,
+    "slow": OpenMayaAnim.MFnAnimCurve.kTangentSlow,
+    "spline": OpenMayaAnim.MFnAnimCurve.kTangentSmooth,
+    "stepnext": OpenMayaAnim.MFnAnimCurve.kTangentStepNext,
+}
 
 
 # ----------------------------------------------------------------------------
 
 
-def anchorSelection(driver, start, end):
+def anchorSelection(driver, start, end, transforms=None):
     """
     Anchor the selected transform for the parsed time range. Uses the 
     :func:`anchorTransform` function. The selected transforms will be checked
     to see if all attribute channels are open for key frame if this is not 
-    the case a dialog box will ask for the users permission to continue.
+    the case a dialog box will ask for the users permission to continue. If
+    the selection is already known it can be provided, if not it will be 
+    retrieved.
     
     :param str driver: Path to the driver transform
     :param int start: Start time value
     :param int end: End time value
+    :param list/None transforms: Paths to the selected transforms
     """
-    invalidChannels = []
+    # clear the caches once for the entire selection, sharing the cached 
+    # dag paths between the validation and the anchoring of the transforms
+    with utils.CacheContext():
+        invalidChannels = []
+        invalidAttributes = {}
     
-    # get selection
-    transforms = cmds.ls(sl=True, transforms=True) or [] 
+        # get selection
+        if transforms is None:
+            transforms = cmds.ls(sl=True, transforms=True, long=True) or [] 
     
-    # make sure the driver is not inside the transforms list
-    transforms = [t for t in transforms if not t == driver]
+        # make sure the driver is not inside the transforms list
+        drivers = [driver] + (cmds.ls(driver, long=True) or []) \
+            if driver else []
+        transforms = [t for t in transforms if t not in drivers]
     
-    # check for invalid selection
-    for transform in transforms:
-        invalidChannels.extend(
-            utils.getInvalidAttributes(transform)
-        )
+        # check for invalid selection
+        for transform in transforms:
+            invalidAttributes[transform] = list(
+                utils.getInvalidAttributes(transform)
+            )
+            invalidChannels.extend(invalidAttributes[transform])
      
-    if invalidChannels:
-        if not utils.displayConfirmDialog(invalidChannels):
-            return 
+        if invalidChannels:
+            # import ui utils when needed, keeping the commands usable 
+            # without the qt libraries loaded
+            from . import ui_utils
+            if not ui_utils.displayConfirmDialog(invalidChannels):
+                return 
     
-    # anchor transforms
-    for transform in transforms:
-        anchorTransform(transform, driver, start, end)
+        # anchor transforms, evaluating in dg mode for the entire selection
+        with utils.EvaluationModeContext():
+            for transform in transforms:
+                anchorTransform(
+                    transform, 
+                    driver, 
+                    start, 
+                    end, 
+                    invalidAttributes[transform]
+                )
 
 
-def anchorTransform(transform, driver, start, end):
+def anchorTransform(transform, driver, start, end, invalidAttributes=None):
     """
     Anchor a transform for the parsed time range, ideal to fix sliding feet. 
     Function will take into account the in and out tangents in case the 
-    transform is already animated. 
+    transform is already animated. The invalid attributes can be provided 
+    if they are already known, if not they will be retrieved.
     
     :param str transform: Path to transform
     :param str driver: Path to the driver transform
     :param int start: Start time value
     :param int end: End time value
+    :param list/None invalidAttributes: Invalid attributes of the transform
     """ 
-    # wrap in an undo chunk
-    with utils.UndoChunkContext():
+    # wrap in an undo chunk and evaluate in dg mode, when called from 
+    # :func:`anchorSelection` dg mode is already active and the caches are
+    # cleared once for the entire selection
+    with utils.EvaluationModeContext(), utils.UndoChunkContext(), \
+            utils.CacheContext():
         # get parent
         rotOrder = cmds.getAttr("{0}.rotateOrder".format(transform))
         
-        # get driver matrix
-        driverInverseMatrix = utils.getMatrix(
-            driver,
-            start,
-            "worldInverseMatrix"
-        )
-
         # get start matrix
         anchorMatrix = utils.getMatrix(
             transform,
@@ -80,84 +105,99 @@ def anchorTransform(transform, driver, start, end):
             "worldMatrix"
         )
         
+        # get transform matrices
+        inverseMatrices = utils.getMatrices(
+            transform,
+            start,
+            end - 1,
+            "parentInverseMatrix"
+        )
+        
         # get invalid attributes
-        invalidAttributes = utils.getInvalidAttributes(transform)
+        if invalidAttributes is None:
+            invalidAttributes = utils.getInvalidAttributes(transform)
+            
+        invalidAttributes = frozenset(invalidAttributes)
         
-        # key frame attributes
-        for i in range(start, end):
-            # get driver and transform matrices
-            driverMatrix = utils.getMatrix(
+        # get nodes
+        nodes = tuple(
+            transform + "." + channelAttr
+            for channelAttr in utils.CHANNEL_ATTRIBUTES
+        )
+        
+        # get valid nodes, skipping invalid attributes
+        validNodes = [
+            (k, node) 
+            for k, node in enumerate(nodes) 
+            if node not in invalidAttributes
+        ]
+        
+        # get boundary tangents of existing animation
+        animCurves = utils.getAnimCurves(transform)
+        nodeTangents = {}
+        for k, node in validNodes:
+            tangents = {
+                "inTangentType": TANGENTS["linear"],
+                "outTangentType": TANGENTS["linear"]
+            }
+            
+            # adjust tangents
+            animCurve = animCurves.get(utils.CHANNEL_ATTRIBUTES[k])
+            if animCurve:
+                tangent = utils.getInTangent(animCurve, start)
+                tangents["inTangentType"] = TANGENTS.get(
+                    tangent, 
+                    tangents["inTangentType"]
+                )
+                    
+            nodeTangents[node] = tangents
+        
+        # calculate local matrices, when anchoring in world space the driver
+        # matrices are all identity matrices and can be left out
+        if driver and inverseMatrices:
+            driverMatrices = utils.getMatrices(
                 driver,
-                i,
+                start,
+                end - 1,
                 "worldMatrix"
             )
-
-            inverseMatrix = utils.getMatrix(
-                transform, 
-                i, 
-                "parentInverseMatrix"
-            )
-
-            # get driver matrix difference
-            differenceMatrix = driverInverseMatrix * driverMatrix
-
-            # get local matrix
-            localMatrix = differenceMatrix * anchorMatrix * inverseMatrix
-                    
-            # extract transform values from matrix
-            rotPivot = cmds.getAttr("{0}.rotatePivot".format(transform))[0]   
-            transformValues = utils.decomposeMatrix(
-                localMatrix, 
-                rotOrder, 
-                rotPivot,
-            )
             
-            for attr, value in zip(utils.ATTRIBUTES, transformValues):
-                for j, channel in enumerate(utils.CHANNELS):
-                    # variables
-                    node = "{0}.{1}{2}".format(transform, attr, channel)
-                    tangents = {
-                        "inTangentType": "linear",
-                        "outTangentType": "linear"
-                    }
-                    
-                    # skip if its an invalid attribute
-                    if node in invalidAttributes:
-                        continue
-                    
-                    # check if input connections are
-                    animInputs = cmds.listConnections(
-                        node, 
-                        type="animCurve",
-                        destination=False
-                    )
-
-                    # adjust tangents
-                    if animInputs and i == end:
-                        tangent = utils.getOutTangent(
-                            animInputs[0], 
-                            end
-                        )
-                        
-                        if tangent in TANGENTS:
-                            tangents["outTangentType"] = tangent
-                            
-                    elif animInputs and i == start:
-                        tangent = utils.getInTangent(
-                            animInputs[0], 
-                            start
-                        )
-                        
-                        if tangent in TANGENTS:
-                            tangents["inTangentType"] = tangent
-                        
-                    # set key frame
-                    cmds.setKeyframe(
-                        node, 
-                        t=i, 
-                        v=value[j],
-                        **tangents
-                    )
+            # get driver inverse matrix at the start frame from the already
+            # sampled driver matrices
+            driverInverseMatrix = driverMatrices[0].inverse()
+            
+            localMatrices = [
+                driverInverseMatrix * driverMatrix * 
+                anchorMatrix * inverseMatrix
+                for driverMatrix, inverseMatrix in zip(
+                    driverMatrices, 
+                    inverseMatrices
+                )
+            ]
+        else:
+            localMatrices = [
+                anchorMatrix * inverseMatrix
+                for inverseMatrix in inverseMatrices
+            ]
+        
+        # calculate transform values
+        times = range(start, end)
+        rotPivot = utils.getRotatePivot(transform)
+        transformValues = utils.decomposeMatrices(
+            localMatrices,
+            rotOrder,
+            rotPivot
+        )
+            
+        # key frame attributes
+        for k, node in validNodes:
+            i, j = divmod(k, len(utils.CHANNELS))
+            utils.setKeyframes(
+                node, 
+                times, 
+                [values[i][j] for values in transformValues],
+                **nodeTangents[node]
+            )
         
         # apply euler filter
         utils.applyEulerFilter(transform)
@@ -1,74 +1,66 @@
 import os
 from maya import cmds
-from . import utils, commands
+from . import utils, ui_utils, commands
 
 # ----------------------------------------------------------------------------
 
 
-ICON_PATH = utils.getIconPath("AT_icon.png")
+ICON_PATH = ui_utils.getIconPath("AT_icon.png")
 
 
 # ----------------------------------------------------------------------------
 
 
-class TimeInput(utils.QWidget):
+class TimeInput(ui_utils.QWidget):
     def __init__(self, parent, label, default):
-        utils.QWidget.__init__(self, parent)
+        ui_utils.QWidget.__init__(self, parent)
         
         # create layout
-        layout = utils.QHBoxLayout(self)
+        layout = ui_utils.QHBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(3)
         
         # create label
-        l = utils.QLabel(self)
+        l = ui_utils.QLabel(self)
         l.setText(label)
-        l.setFont(utils.FONT)
         l.setFixedWidth(100)
         layout.addWidget(l)
         
         # create time
-        self.time = utils.QSpinBox(self)
+        self.time = ui_utils.QSpinBox(self)
         self.time.setMinimum(0)
         self.time.setMaximum(9999)
         self.time.setValue(default)
-        self.time.setFont(utils.FONT)
         layout.addWidget(self.time)
         
-    # ------------------------------------------------------------------------
-
-    @property
-    def value(self):
-        return self.time.value()
+        # expose the value of the spin box directly
+        self.value = self.time.value
 
 
-class DriverInput(utils.QWidget):
+class DriverInput(ui_utils.QWidget):
     def __init__(self, parent):
-        utils.QWidget.__init__(self, parent)
+        ui_utils.QWidget.__init__(self, parent)
         
         # create layout
-        layout = utils.QHBoxLayout(self)
+        layout = ui_utils.QHBoxLayout(self)
         layout.setContentsMargins(0, 0, 0, 0)
         layout.setSpacing(3)
         
         # create label
-        l = utils.QLabel(self)
+        l = ui_utils.QLabel(self)
         l.setText("Driver")
-        l.setFont(utils.FONT)
         l.setFixedWidth(100)
         layout.addWidget(l)
                 
         # create edit
-        self.edit = utils.QLineEdit(self)
+        self.edit = ui_utils.QLineEdit(self)
         self.edit.setPlaceholderText("World")
-        self.edit.setFont(utils.FONT)
         self.edit.setEnabled(False)
         layout.addWidget(self.edit)
         
         # create button
-        button = utils.QPushButton(self)
+        button = ui_utils.QPushButton(self)
         button.setText("Selected")
-        button.setFont(utils.FONT)
         button.setFixedWidth(75)
         button.released.connect(self.setTransform)
         layout.addWidget(button)
@@ -90,21 +82,20 @@ class DriverInput(utils.QWidget):
 # ----------------------------------------------------------------------------
 
 
-class AnchorTransformWidget(utils.QWidget):
+class AnchorTransformWidget(ui_utils.QWidget):
     def __init__(self, parent):
-        utils.QWidget.__init__(self, parent)
+        ui_utils.QWidget.__init__(self, parent, ui_utils.Qt.Window)
         
         # set ui
-        self.setParent(parent)        
-        self.setWindowFlags(utils.Qt.Window)  
+        self.setFont(ui_utils.FONT)
 
         self.setWindowTitle("Anchor Transform")      
-        self.setWindowIcon(utils.QIcon(ICON_PATH))
+        self.setWindowIcon(ui_utils.QIcon(ICON_PATH))
         
         self.resize(300, 100)
         
         # create layout
-        layout = utils.QVBoxLayout(self)
+        layout = ui_utils.QVBoxLayout(self)
         layout.setContentsMargins(5, 5, 5, 5)
         layout.setSpacing(3)
         
@@ -113,7 +104,7 @@ class AnchorTransformWidget(utils.QWidget):
         layout.addWidget(self.driver)
         
         # divider
-        layout.addWidget(utils.divider(self))
+        layout.addWidget(ui_utils.divider(self))
         
         # time input
         self.start = TimeInput(self, "Start Frame", 1001)
@@ -125,24 +116,22 @@ class AnchorTransformWidget(utils.QWidget):
         layout.addWidget(self.end)
         
         # divider
-        layout.addWidget(utils.divider(self))
+        layout.addWidget(ui_utils.divider(self))
         
         # create time control checkbox
-        self.timeline = utils.QCheckBox(self)
+        self.timeline = ui_utils.QCheckBox(self)
         self.timeline.setChecked(True)
         self.timeline.setText("From Time Control Selection")
-        self.timeline.setFont(utils.FONT)
         self.timeline.stateChanged.connect(self.setManualInputField)
         layout.addWidget(self.timeline)
         
         # divider
-        layout.addWidget(utils.divider(self))
+        layout.addWidget(ui_utils.divider(self))
                 
         # create button
-        button = utils.QPushButton(self)
+        button = ui_utils.QPushButton(self)
         button.pressed.connect(self.doAnchor)
         button.setText("Anchor Selected Transforms")
-        button.setFont(utils.FONT)
         button.setFocus()
         layout.addWidget(button)
         
@@ -161,8 +150,12 @@ class AnchorTransformWidget(utils.QWidget):
         :return: Frame range
         :rtype: list/None
         """
+        # the range visibility has to be queried separately, without a 
+        # visible range the range array still returns the current frame and
+        # the frame after, which can't be told apart from a selected range
+        timeline = utils.getMayaTimeline()
         rangeVisible = cmds.timeControl(
-            utils.getMayaTimeline(), 
+            timeline, 
             q=True, 
             rangeVisible=True
         )
@@ -171,7 +164,7 @@ class AnchorTransformWidget(utils.QWidget):
             return
         
         r = cmds.timeControl(
-            utils.getMayaTimeline(), 
+            timeline, 
             query=True, 
             ra=True
         )
@@ -184,10 +177,11 @@ class AnchorTransformWidget(utils.QWidget):
         :return: Frame range
         :rtype: list/None
         """
-        if self.start.value >= self.end.value:
+        start, end = self.start.value(), self.end.value()
+        if start >= end:
             return
             
-        return [self.start.value, self.end.value]
+        return [start, end]
 
     def getFrameRange(self):
         """
@@ -204,20 +198,46 @@ class AnchorTransformWidget(utils.QWidget):
     def doAnchor(self):
         """
         Anchor selected transforms. Will raise a value error of not valid 
-        frame range can be read from the UI settings.
+        frame range can be read from the UI settings or if no transforms are
+        selected. All changes are combined into a single undo and the 
+        viewports are not refreshed until all transforms are anchored.
         
         :raise ValueError: When no valid frame range is found
+        :raise ValueError: When no transforms are selected
         """
         frameRange = self.getFrameRange()
         if not frameRange:
             raise ValueError("No valid frame range could be found!")
+            
+        transforms = cmds.ls(sl=True, transforms=True, long=True)
+        if not transforms:
+            raise ValueError("No transforms are selected!")
 
-        commands.anchorSelection(self.driver.transform, *frameRange)
+        with utils.UndoChunkContext(), utils.RefreshSuspendContext():
+            commands.anchorSelection(
+                self.driver.transform, 
+                frameRange[0],
+                frameRange[1],
+                transforms
+            )
 
 
 # ----------------------------------------------------------------------------
 
 
+DIALOG = None
+
+
 def show():
-    dialog = AnchorTransformWidget(utils.mayaWindow())
-    dialog.show()
+    """
+    Show the anchor transform window. The window is only created the first
+    time, after that the existing window is raised. A new window is created
+    if the previous one has been deleted.
+    """
+    global DIALOG
+    if DIALOG is None or not ui_utils.shiboken.isValid(DIALOG):
+        DIALOG = AnchorTransformWidget(ui_utils.mayaWindow())
+        
+    DIALOG.show()
+    DIALOG.raise_()
+    DIALOG.activateWindow()
@@ -0,0 +1,155 @@
+import os
+from maya import cmds, OpenMayaUI
+from . import utils
+
+
+# ----------------------------------------------------------------------------
+
+
+# get string and integer types, python 3 has no unicode and long type
+try:
+    STRING_TYPES = (str, unicode)
+    LONG = long
+except NameError:
+    STRING_TYPES = (str,)
+    LONG = int
+
+
+# import pyside, do qt version check for maya 2017 >
+qtVersion = cmds.about(qtVersion=True)
+if qtVersion.startswith("4") or not isinstance(qtVersion, STRING_TYPES):
+    from PySide.QtCore import Qt
+    from PySide.QtGui import (
+        QCheckBox, QFont, QFrame, QHBoxLayout, QIcon, QLabel, QLineEdit,
+        QMainWindow, QMessageBox, QPushButton, QSpinBox, QVBoxLayout, QWidget
+    )
+    import shiboken
+else:
+    from PySide2.QtCore import Qt
+    from PySide2.QtGui import QFont, QIcon
+    from PySide2.QtWidgets import (
+        QCheckBox, QFrame, QHBoxLayout, QLabel, QLineEdit, QMainWindow, 
+        QMessageBox, QPushButton, QSpinBox, QVBoxLayout, QWidget
+    )
+    import shiboken2 as shiboken
+
+# ----------------------------------------------------------------------------
+
+FONT = QFont("Consolas")
+
+BOLT_FONT = QFont("Consolas")
+BOLT_FONT.setWeight(100)
+
+
+# ----------------------------------------------------------------------------
+
+
+MAIN_WINDOW = None
+
+
+def mayaWindow():
+    """
+    Get Maya's main window. The main window exists for the entire Maya 
+    session, so it is cached after it has been wrapped once.
+    
+    :rtype: QMainWindow
+    """
+    global MAIN_WINDOW
+    if MAIN_WINDOW is None:
+        window = OpenMayaUI.MQtUtil.mainWindow()
+        MAIN_WINDOW = shiboken.wrapInstance(LONG(window), QMainWindow)
+    
+    return MAIN_WINDOW
+
+
+# ----------------------------------------------------------------------------
+
+
+def divider(parent):
+    """
+    Create divider ui widget.
+
+    :param QWidget parent:
+    :rtype: QFrame
+    """
+    line = QFrame(parent)
+    line.setFrameShape(QFrame.HLine)
+    line.setFrameShadow(QFrame.Sunken)
+    return line
+
+
+# ----------------------------------------------------------------------------
+
+
+ICON_CACHE = {}
+ICON_PATHS = None
+
+
+def getIconPath(name):
+    """
+    Get an icon path based on file name. The icons directory of the module 
+    and all paths in the XBMLANGPATH variable are processed to see if the 
+    provided icon can be found. The paths to process are collected once and
+    the results are cached per file name.
+
+    :param str name:
+    :return: Icon path
+    :rtype: str/None
+    """
+    global ICON_PATHS
+    if name in ICON_CACHE:
+        return ICON_CACHE[name]
+        
+    # get icon paths
+    if ICON_PATHS is None:
+        ICON_PATHS = [os.path.join(utils.MODULE_PATH, "icons")]
+        ICON_PATHS.extend(
+            os.environ.get("XBMLANGPATH", "").split(os.pathsep)
+        )
+        
+    # find icon
+    ICON_CACHE[name] = None
+    for path in ICON_PATHS:
+        iconPath = os.path.join(path, name)
+        if os.path.isfile(iconPath):
+            ICON_CACHE[name] = iconPath.replace("\\", "/")
+            break
+            
+    return ICON_CACHE[name]
+
+
+# ----------------------------------------------------------------------------
+
+
+def displayConfirmDialog(invalidAttributes):
+    """
+    Display confirm dialog, presenting the user with the invalid attributes
+    that were found.
+
+    :param list/generator invalidAttributes: Invalid attributes
+    :return: Continue state
+    :rtype: bool
+    """
+    invalidAttributes = list(invalidAttributes)
+    
+    # construct message
+    message = "{0}\n{1}\n\n{2}\n\n{3}".format(
+        "The following invalid attributes where found",
+        "and will be ignored!",
+        "\n".join(invalidAttributes),
+        "Would you like to continue?"
+    )
+    
+    # create dialog
+    ret = QMessageBox.warning(
+        mayaWindow(), 
+        "Invalid Attributes",
+        message,
+        QMessageBox.Ok | QMessageBox.Cancel
+    )
+    
+    # return results
+    if ret == QMessageBox.Ok:
+        return True
+        
+    return False
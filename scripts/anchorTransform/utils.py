@@ -1,32 +1,8 @@
 import os
 import math
-from maya import cmds, mel, OpenMayaUI
-from maya.api import OpenMaya
-
-
-# ----------------------------------------------------------------------------
-
-
-# import pyside, do qt version check for maya 2017 >
-qtVersion = cmds.about(qtVersion=True)
-if qtVersion.startswith("4") or type(qtVersion) not in [str, unicode]:
-    from PySide.QtGui import *
-    from PySide.QtCore import *
-    import shiboken
-else:
-    from PySide2.QtGui import *
-    from PySide2.QtCore import *
-    from PySide2.QtWidgets import *
-    import shiboken2 as shiboken
-
-# ----------------------------------------------------------------------------
-
-FONT = QFont()
-FONT.setFamily("Consolas")
-
-BOLT_FONT = QFont()
-BOLT_FONT.setFamily("Consolas")
-BOLT_FONT.setWeight(100)
+import bisect
+from maya import cmds, mel
+from maya.api import OpenMaya, OpenMayaAnim
 
 
 # ----------------------------------------------------------------------------
@@ -47,98 +23,109 @@ class UndoChunkContext(object):
         cmds.undoInfo(closeChunk=True)
 
 
-# ----------------------------------------------------------------------------
-
-
-def mayaWindow():
+class EvaluationModeContext(object):
     """
-    Get Maya's main window.
+    The evaluation mode context is used to temporarily switch the evaluation
+    manager to a different mode, by default DG mode. This prevents the 
+    evaluation graph from being rebuilt in between the many queries made at
+    different moments in time. The previous mode is restored on exit. When 
+    the evaluation manager already is in the requested mode nothing is 
+    changed, this makes it cheap to nest the context. Maya versions without
+    an evaluation manager are left untouched. Can be used in combination 
+    with the "with" statement.
     
-    :rtype: QMainWindow
+    with EvaluationModeContext():
+        # code
     """
-    window = OpenMayaUI.MQtUtil.mainWindow()
-    window = shiboken.wrapInstance(long(window), QMainWindow)
-    
-    return window  
+    def __init__(self, mode="off"):
+        self.mode = mode
+        self.previousMode = None
+        
+    def __enter__(self):
+        if not hasattr(cmds, "evaluationManager"):
+            return
+            
+        previousMode = cmds.evaluationManager(query=True, mode=True)[0]
+        if previousMode == self.mode:
+            return
+            
+        self.previousMode = previousMode
+        cmds.evaluationManager(mode=self.mode)
+        
+    def __exit__(self, *exc_info):
+        if self.previousMode is not None:
+            cmds.evaluationManager(mode=self.previousMode)
+            self.previousMode = None
 
 
-def getMayaTimeline():
+class RefreshSuspendContext(object):
     """
-    Get the object name of Maya's timeline.
+    The refresh suspend context is used to suspend the refresh of the 
+    viewports while a chain of commands is executed, preventing a redraw for
+    every change. The viewports are refreshed once on exit. Can be used in 
+    combination with the "with" statement.
     
-    :return: Object name of Maya's timeline
-    :rtype: str
+    with RefreshSuspendContext():
+        # code
     """
-    return mel.eval("$tmpVar=$gPlayBackSlider")
+    def __enter__(self):
+        cmds.refresh(suspend=True)
+        
+    def __exit__(self, *exc_info):
+        cmds.refresh(suspend=False)
+        cmds.refresh(force=True)
 
 
 # ----------------------------------------------------------------------------
 
 
-def divider(parent):
-    """
-    Create divider ui widget.
+MODULE_PATH = os.path.abspath(os.path.join(__file__, "..", "..", ".."))
 
-    :param QWidget parent:
-    :rtype: QFrame
-    """
-    line = QFrame(parent)
-    line.setFrameShape(QFrame.HLine)
-    line.setFrameShadow(QFrame.Sunken)
-    return line
+UNDO_PLUGIN_NAME = "anchorTransformUndo"
+UNDO_PLUGIN_PATH = os.path.join(
+    MODULE_PATH,
+    "plug-ins",
+    "{0}.py".format(UNDO_PLUGIN_NAME)
+)
+UNDO_QUEUE = []
 
 
-# ----------------------------------------------------------------------------
-
-
-def getIconPath(name):
+def registerUndo(undo, redo):
     """
-    Get an icon path based on file name. All paths in the XBMLANGPATH variable
-    processed to see if the provided icon can be found.
-
-    :param str name:
-    :return: Icon path
-    :rtype: str/None
+    Add changes made using the Maya API to the undo queue. The changes are
+    expected to be performed already. The undo plugin will be loaded if this
+    is not the case yet, its command will take the undo and redo functions 
+    from the queue.
+    
+    :param func undo: Function to undo the changes
+    :param func redo: Function to redo the changes
     """
-    for path in os.environ.get("XBMLANGPATH").split(os.pathsep):
-        iconPath = os.path.join(path, name)
-        if os.path.exists(iconPath):
-            return iconPath.replace("\\", "/")
+    if not cmds.pluginInfo(UNDO_PLUGIN_NAME, query=True, loaded=True):
+        cmds.loadPlugin(UNDO_PLUGIN_PATH, quiet=True)
+        
+    UNDO_QUEUE.append((undo, redo))
+    getattr(cmds, UNDO_PLUGIN_NAME)()
 
 
 # ----------------------------------------------------------------------------
 
 
-def displayConfirmDialog(invalidAttributes):
-    """
-    Display confirm dialog, presenting the user with the invalid attributes
-    that were found.
+TIMELINE = None
 
-    :param list invalidAttributes: List of invalid attributes
-    :return: Continue state
-    :rtype: bool
+
+def getMayaTimeline():
     """
-    # construct message
-    message = "{0}\n{1}\n\n{2}\n\n{3}".format(
-        "The following invalid attributes where found",
-        "and will be ignored!",
-        "\n".join(invalidAttributes),
-        "Would you like to continue?"
-    )
+    Get the object name of Maya's timeline. The name doesn't change during a
+    Maya session, so it is cached after it has been retrieved once.
     
-    # create dialog
-    ret = QMessageBox.warning(
-        mayaWindow(), 
-        "Invalid Attributes",
-        message,
-        QMessageBox.Ok | QMessageBox.Cancel
-    )
-    
-    # return results
-    if ret == QMessageBox.Ok:
-        return True
+    :return: Object name of Maya's timeline
+    :rtype: str
+    """
+    global TIMELINE
+    if TIMELINE is None:
+        TIMELINE = mel.eval("$tmpVar=$gPlayBackSlider")
         
-    return False
+    return TIMELINE
 
 
 # ----------------------------------------------------------------------------
@@ -147,64 +134,193 @@ def displayConfirmDialog(invalidAttributes):
 ATTRIBUTES = ["translate", "rotate", "scale"]
 CHANNELS = ["X", "Y", "Z"]
 
+ATTRIBUTE_CHANNELS = tuple(
+    tuple(attr + channel for channel in CHANNELS)
+    for attr in ATTRIBUTES
+)
+CHANNEL_ATTRIBUTES = tuple(
+    channelAttr
+    for channelAttributes in ATTRIBUTE_CHANNELS
+    for channelAttr in channelAttributes
+)
+
+
+# ----------------------------------------------------------------------------
+
+
+DAG_PATH_CACHE = {}
+
+
+def getDagPath(transform):
+    """
+    Get the dag path of the transform. The dag paths are cached per 
+    transform, the cache can be cleared using :func:`clearCaches`. A cached
+    dag path is only used if its node still exists and still matches the 
+    transform path, protecting against renamed or deleted nodes.
+    
+    :param str transform: Path to transform
+    :return: Dag path
+    :rtype: OpenMaya.MDagPath
+    """
+    dagPath = DAG_PATH_CACHE.get(transform)
+    if dagPath is not None \
+            and OpenMaya.MObjectHandle(dagPath.node()).isValid() \
+            and transform in (dagPath.partialPathName(), 
+                              dagPath.fullPathName()):
+        return dagPath
+        
+    selection = OpenMaya.MSelectionList()
+    selection.add(transform)
+    dagPath = selection.getDagPath(0)
+    
+    DAG_PATH_CACHE[transform] = dagPath
+    return dagPath
+    
+    
+def getRotatePivot(transform):
+    """
+    Get the rotate pivot of the transform in transform space.
+    
+    :param str transform: Path to transform
+    :return: Rotate pivot
+    :rtype: list
+    """
+    transformFn = OpenMaya.MFnTransform(getDagPath(transform))
+    rotPivot = transformFn.rotatePivot(OpenMaya.MSpace.kTransform)
+    return [rotPivot.x, rotPivot.y, rotPivot.z]
+
 
 # ----------------------------------------------------------------------------
 
 
+ANIM_CURVE_TYPES = frozenset([
+    OpenMaya.MFn.kAnimCurveTimeToAngular,
+    OpenMaya.MFn.kAnimCurveTimeToDistance,
+    OpenMaya.MFn.kAnimCurveTimeToTime,
+    OpenMaya.MFn.kAnimCurveTimeToUnitless,
+])
+
+
 def getInvalidAttributes(transform):
     """
     Loop over the transform attributes of the transform and see if the 
-    attributes are locked or connected to anything other than a animation 
-    curve. If this is the case the attribute is invalid.
+    attributes are locked or connected to anything other than a time based 
+    animation curve, driven keys are invalid as well. If this is the case 
+    the attribute is invalid. The plugs are inspected using the Maya API, 
+    avoiding a command for every query. The invalid attributes are yielded
+    as they are found, allowing the caller to stop early.
     
     :param str transform: Path to transform
-    :return: List of invalid attributes.
-    :rtype: list
+    :return: Invalid attributes.
+    :rtype: generator
     """
-    invalidChannels = []
-    for attr in ATTRIBUTES:
+    # get dependency node
+    dependNode = OpenMaya.MFnDependencyNode(getDagPath(transform).node())
+    
+    prefix = transform + "."
+    for attr, channelAttributes in zip(ATTRIBUTES, ATTRIBUTE_CHANNELS):
         # get connection of parent attribute
-        node = "{0}.{1}".format(transform, attr)
-        if cmds.listConnections(node, destination=False):
-            invalidChannels.extend(
-                [
-                    node + channel
-                    for channel in CHANNELS
-                ]
-            )
+        if dependNode.findPlug(attr, False).isDestination:
+            for channelAttr in channelAttributes:
+                yield prefix + channelAttr
+                
             continue
 
         # get connection of individual channels
-        for channel in CHANNELS:
-            node = "{0}.{1}{2}".format(transform, attr, channel)
+        for channelAttr in channelAttributes:
+            plug = dependNode.findPlug(channelAttr, False)
             
             # get connections
-            animInputs = cmds.listConnections(
-                node, 
-                type="animCurve",
-                destination=False
-            )
-            allInputs = cmds.listConnections(
-                node,
-                destination=False,
+            sources = plug.connectedTo(True, False)
+            animated = any(
+                source.node().apiType() in ANIM_CURVE_TYPES
+                for source in sources
             )
             
-            # check if connections are not of anim curve type
-            locked = cmds.getAttr(node, lock=True)
-            if (not animInputs and allInputs) or locked:
-                invalidChannels.append(node)
-                
-    return invalidChannels
+            # check if connections are not of time based anim curve type
+            if (sources and not animated) or plug.isLocked:
+                yield prefix + channelAttr
+
+
+def getAnimCurves(transform):
+    """
+    Get the time based animation curves connected to the channels of the
+    transform. The plugs are inspected using the Maya API, avoiding a
+    command for every query. The returned dictionary maps the channel
+    attribute names to the animation curves driving them.
+
+    :param str transform: Path to transform
+    :return: Animation curves
+    :rtype: dict
+    """
+    # get dependency node
+    dependNode = OpenMaya.MFnDependencyNode(getDagPath(transform).node())
+
+    animCurves = {}
+    for channelAttr in CHANNEL_ATTRIBUTES:
+        plug = dependNode.findPlug(channelAttr, False)
+        sources = plug.connectedTo(True, False)
+        if not sources:
+            continue
+
+        # get source of time based anim curve type
+        source = sources[0].node()
+        if source.apiType() in ANIM_CURVE_TYPES:
+            animCurves[channelAttr] = OpenMaya.MFnDependencyNode(
+                source
+            ).name()
+
+    return animCurves
 
 
 # ----------------------------------------------------------------------------
 
 
-def getMatrix(transform, time=None, matrixType="worldMatrix"):
+class MatrixSampler(object):
+    """
+    The matrix sampler resolves the plug of the desired matrix type from the
+    transform once, after which it can be sampled at any moment in time 
+    using a dependency graph context. This avoids the string parsing of a 
+    getAttr command for every sample. If no transform is provided empty 
+    matrices will be returned.
+    
+    sampler = MatrixSampler(transform, "worldMatrix")
+    matrix = sampler.sample(1001)
+    """
+    def __init__(self, transform, matrixType="worldMatrix"):
+        self.plug = None
+        
+        if not transform:
+            return
+            
+        dagPath = getDagPath(transform)
+        dependNode = OpenMaya.MFnDependencyNode(dagPath.node())
+        
+        self.plug = dependNode.findPlug(matrixType, False)
+        self.plug = self.plug.elementByLogicalIndex(0)
+        
+    # ------------------------------------------------------------------------
+    
+    def sample(self, time):
+        """
+        :param float/int time: Time value
+        :return: Matrix
+        :rtype: OpenMaya.MMatrix
+        """
+        if self.plug is None:
+            return OpenMaya.MMatrix()
+            
+        time = OpenMaya.MTime(time, OpenMaya.MTime.uiUnit())
+        context = OpenMaya.MDGContext(time)
+        matrixData = OpenMaya.MFnMatrixData(self.plug.asMObject(context))
+        return matrixData.matrix()
+
+
+def getMatrix(transform, time, matrixType="worldMatrix"):
     """
     Get the matrix of the desired matrix type from the transform in a specific
     moment in time. If the transform doesn't exist an empty matrix will be 
-    returned. If not time is specified, the current time will be used.
+    returned.
     
     :param str transform: Path to transform
     :param float/int time: Time value
@@ -212,14 +328,97 @@ def getMatrix(transform, time=None, matrixType="worldMatrix"):
     :return: Matrix
     :rtype: OpenMaya.MMatrix
     """
-    if not transform:
-        return OpenMaya.MMatrix()
-        
-    if not time:
-        time = cmds.currentTime(query=True)
+    return MatrixSampler(transform, matrixType).sample(time)
+
+
+def getMatrices(transform, start, end, matrixType="worldMatrix"):
+    """
+    Get the matrices of the desired matrix type from the transform for every
+    frame in the provided time range, the end frame is included. The plug is
+    resolved once using a :class:`MatrixSampler` and sampled for every frame.
+    If no transform is provided empty matrices will be returned.
+    
+    :param str transform: Path to transform
+    :param int start: Start time value
+    :param int end: End time value
+    :param str matrixType: Matrix type to query
+    :return: Matrices
+    :rtype: list
+    """
+    sampler = MatrixSampler(transform, matrixType)
+    return [sampler.sample(i) for i in range(start, end + 1)]
 
-    matrix = cmds.getAttr("{0}.{1}".format(transform, matrixType), time=time)
-    return OpenMaya.MMatrix(matrix)
+
+RAD_TO_DEG = 180.0 / math.pi
+
+ROTATE_ORDERS = (
+    OpenMaya.MEulerRotation.kXYZ,
+    OpenMaya.MEulerRotation.kYZX,
+    OpenMaya.MEulerRotation.kZXY,
+    OpenMaya.MEulerRotation.kXZY,
+    OpenMaya.MEulerRotation.kYXZ,
+    OpenMaya.MEulerRotation.kZYX,
+)
+
+
+class MatrixDecomposer(object):
+    """
+    The matrix decomposer is used to decompose matrices into translation, 
+    rotation and scale values. The rotation order and rotation pivot are 
+    stored on the decomposer, this way the rotation order is only mapped to
+    its euler rotation order and the pivot point is only constructed once 
+    for all of the matrices that are decomposed.
+    
+    decomposer = MatrixDecomposer(rotOrder, rotPivot)
+    values = decomposer.decompose(matrix)
+    """
+    def __init__(self, rotOrder, rotPivot):
+        self.rotOrder = ROTATE_ORDERS[rotOrder]
+        self.rotPivot = OpenMaya.MPoint(rotPivot)
+        
+    # ------------------------------------------------------------------------
+    
+    def decompose(self, matrix):
+        """
+        :param OpenMaya.MMatrix matrix:
+        :return: Translate, rotate and scale values
+        :rtype: tuple
+        """
+        matrixTransform = OpenMaya.MTransformationMatrix(matrix)
+        
+        # set pivots
+        matrixTransform.setRotatePivot(
+            self.rotPivot, 
+            OpenMaya.MSpace.kTransform, 
+            True
+        )
+        
+        # get rotation pivot translation
+        posOffset =  matrixTransform.rotatePivotTranslation(
+            OpenMaya.MSpace.kTransform
+        )
+        
+        # get pos values
+        pos = matrixTransform.translation(OpenMaya.MSpace.kTransform)
+        pos = (
+            pos.x + posOffset.x, 
+            pos.y + posOffset.y, 
+            pos.z + posOffset.z
+        )
+        
+        # get rot values
+        euler = matrixTransform.rotation()
+        euler.reorderIt(self.rotOrder)
+        rot = (
+            euler.x * RAD_TO_DEG, 
+            euler.y * RAD_TO_DEG, 
+            euler.z * RAD_TO_DEG
+        )
+        
+        # get scale values
+        scale = matrixTransform.scale(OpenMaya.MSpace.kTransform)
+        
+        return pos, rot, scale
 
 
 def decomposeMatrix(matrix, rotOrder, rotPivot):
@@ -232,39 +431,97 @@ def decomposeMatrix(matrix, rotOrder, rotPivot):
     :param int rotOrder: Rotation order
     :param list rotPivot: Rotation pivot
     :return: Translate, rotate and scale values
-    :rtype: list
+    :rtype: tuple
     """
-    matrixTransform = OpenMaya.MTransformationMatrix(matrix)
-    
-    # set pivots
-    matrixTransform.setRotatePivot(
-        OpenMaya.MPoint(rotPivot), 
-        OpenMaya.MSpace.kTransform, 
-        True
-    )
-    
-    # get rotation pivot translation
-    posOffset =  matrixTransform.rotatePivotTranslation(
-        OpenMaya.MSpace.kTransform
-    )
+    return MatrixDecomposer(rotOrder, rotPivot).decompose(matrix)
+
+
+def decomposeMatrices(matrices, rotOrder, rotPivot):
+    """
+    Decompose a list of matrices into translation, rotation and scale values.
+    The rotation order and rotation pivot are shared by all matrices, a 
+    single :class:`MatrixDecomposer` is used for the entire batch.
     
-    # get pos values
-    pos = matrixTransform.translation(OpenMaya.MSpace.kTransform)
-    pos += posOffset
-    pos = [pos.x, pos.y, pos.z]
+    :param list matrices:
+    :param int rotOrder: Rotation order
+    :param list rotPivot: Rotation pivot
+    :return: Translate, rotate and scale values for each matrix
+    :rtype: list
+    """
+    decomposer = MatrixDecomposer(rotOrder, rotPivot)
+    return [decomposer.decompose(matrix) for matrix in matrices]
+
+
+# ----------------------------------------------------------------------------
+
+
+KEYFRAME_CACHE = {}
+
+
+def getKeyframes(animCurve):
+    """
+    Get the key frame times and the in and out tangent types of the 
+    animation curve. The tangent types of all key frames are queried at once
+    and stored in the same order as the times. The data is cached per 
+    animation curve, the cache can be cleared using :func:`clearCaches`.
     
-    # get rot values
-    euler = matrixTransform.rotation()
-    euler.reorderIt(rotOrder)
-    rot = [math.degrees(angle) for angle in [euler.x, euler.y, euler.z]]
+    :param str animCurve: Animation curve to query
+    :return: Key frame times, in tangent types and out tangent types
+    :rtype: tuple
+    """
+    if animCurve not in KEYFRAME_CACHE:
+        times = cmds.keyframe(animCurve, query=True, timeChange=True) or []
+        tangents = cmds.keyTangent(
+            animCurve, 
+            query=True, 
+            inTangentType=True, 
+            outTangentType=True
+        ) or []
+        
+        # key frames of an animation curve are always ordered by time, the
+        # tangent types are returned as in and out pairs per key frame
+        KEYFRAME_CACHE[animCurve] = (
+            tuple(times), 
+            tuple(tangents[0::2]), 
+            tuple(tangents[1::2])
+        )
+        
+    return KEYFRAME_CACHE[animCurve]
     
-    # get scale values
-    scale = matrixTransform.scale(OpenMaya.MSpace.kTransform)
     
-    return [pos, rot, scale]
+def clearCaches():
+    """
+    Clear the cached dag paths and key frame data, this should be done 
+    every time the scene could have been changed.
+    """
+    DAG_PATH_CACHE.clear()
+    KEYFRAME_CACHE.clear()
 
 
-# ----------------------------------------------------------------------------
+class CacheContext(object):
+    """
+    The cache context is used to clear the cached dag paths and key frame 
+    data before and after a chain of commands. This ensures the caches are
+    never read from a previous operation and aren't kept in memory 
+    afterwards. When nested only the outer context clears the caches, 
+    allowing the cached data to be shared by all commands in the chain. Can
+    be used in combination with the "with" statement.
+    
+    with CacheContext():
+        # code
+    """
+    depth = 0
+    
+    def __enter__(self):
+        if CacheContext.depth == 0:
+            clearCaches()
+            
+        CacheContext.depth += 1
+        
+    def __exit__(self, *exc_info):
+        CacheContext.depth -= 1
+        if CacheContext.depth == 0:
+            clearCaches()
 
 
 def getInTangent(animCurve, time):
@@ -277,21 +534,12 @@ def getInTangent(animCurve, time):
     :return: In tangent type
     :rtype: str
     """
-    times = cmds.keyframe(animCurve, query=True, timeChange=True) or []
-    for t in times:
-        if t <= time:
-            continue
-        
-        tangent = cmds.keyTangent(
-            animCurve, 
-            time=(t,t), 
-            query=True, 
-            inTangentType=True
-        )
+    times, inTangents, _ = getKeyframes(animCurve)
+    index = bisect.bisect_right(times, time)
+    if index == len(times):
+        return "auto"
         
-        return tangent[0]
-
-    return "auto"
+    return inTangents[index]
 
 
 def getOutTangent(animCurve, time):
@@ -304,22 +552,131 @@ def getOutTangent(animCurve, time):
     :return: Out tangent type
     :rtype: str
     """
-    times = cmds.keyframe(animCurve, query=True, timeChange=True) or []
+    times, _, outTangents = getKeyframes(animCurve)
+    index = bisect.bisect_left(times, time) - 1
+    if index < 0:
+        return "auto"
+        
+    return outTangents[index]
+
+
+# ----------------------------------------------------------------------------
+
+
+TOLERANCE = 1e-6
+
+
+def setKeyframes(node, times, values, 
+                 inTangentType=OpenMayaAnim.MFnAnimCurve.kTangentLinear,
+                 outTangentType=OpenMayaAnim.MFnAnimCurve.kTangentLinear):
+    """
+    Key frame the attribute for all of the parsed times in one batch using 
+    the Maya API. If the attribute is not animated a new animation curve will
+    be created. Existing keys at the parsed times will be replaced. The keys
+    are created with linear tangents, the in tangent of the first key and 
+    the out tangent of the last key can be specified. Values are expected in 
+    ui units, similar to the setKeyframe command. If the existing animation
+    already matches the values within the tolerance no keys are set. The 
+    changes are added to the undo queue.
+    
+    :param str node: Path to attribute
+    :param list times: Time values
+    :param list values: Values
+    :param int inTangentType: In tangent type of the first key
+    :param int outTangentType: Out tangent type of the last key
+    """
+    if not times:
+        return
+        
+    # get plug
+    selection = OpenMaya.MSelectionList()
+    selection.add(node)
+    plug = selection.getPlug(0)
+    
+    # get animation curve
+    modifier = OpenMaya.MDGModifier()
+    change = OpenMayaAnim.MAnimCurveChange()
+    animCurve = OpenMayaAnim.MFnAnimCurve()
+    
+    sources = plug.connectedTo(True, False)
+    if sources:
+        animCurve.setObject(sources[0].node())
+    else:
+        name = "{0}_{1}".format(
+            OpenMaya.MFnDependencyNode(plug.node()).name(),
+            plug.partialName(useLongNames=True)
+        )
+        
+        animCurveObj = animCurve.create(plug, modifier=modifier)
+        modifier.renameNode(animCurveObj, name)
+        modifier.doIt()
+        
+    # get unit conversion
+    if animCurve.animCurveType == OpenMayaAnim.MFnAnimCurve.kAnimCurveTA:
+        factor = OpenMaya.MAngle.uiToInternal(1.0)
+    elif animCurve.animCurveType == OpenMayaAnim.MFnAnimCurve.kAnimCurveTL:
+        factor = OpenMaya.MDistance.uiToInternal(1.0)
+    else:
+        factor = 1.0
+        
+    # get keys
+    timeArray = OpenMaya.MTimeArray()
     for t in times:
-        if t >= time:
-            continue
+        timeArray.append(OpenMaya.MTime(t, OpenMaya.MTime.uiUnit()))
         
-        tangent = cmds.keyTangent(
-            animCurve, 
-            time=(t,t), 
-            query=True, 
-            outTangentType=True
+    valueArray = OpenMaya.MDoubleArray([value * factor for value in values])
+    
+    # skip if the existing animation already matches the values, keys are 
+    # only skipped for the entire curve as adding keys on some of the times
+    # would change the interpolation of the remaining ones
+    if sources and all(
+        abs(animCurve.evaluate(time) - value) < TOLERANCE
+        for time, value in zip(timeArray, valueArray)
+    ):
+        return
+        
+    # remove existing keys
+    for time in timeArray:
+        index = animCurve.find(time)
+        if index is not None:
+            animCurve.remove(index, change)
+            
+    # add keys
+    animCurve.addKeys(
+        timeArray,
+        valueArray,
+        OpenMayaAnim.MFnAnimCurve.kTangentLinear,
+        OpenMayaAnim.MFnAnimCurve.kTangentLinear,
+        True,
+        change
+    )
+    
+    # set boundary tangents, keys are already added with linear tangents
+    if inTangentType != OpenMayaAnim.MFnAnimCurve.kTangentLinear:
+        animCurve.setInTangentType(
+            animCurve.find(timeArray[0]), 
+            inTangentType, 
+            change
         )
         
-        return tangent[0]
-
-    return "auto"
-
+    if outTangentType != OpenMayaAnim.MFnAnimCurve.kTangentLinear:
+        animCurve.setOutTangentType(
+            animCurve.find(timeArray[len(timeArray) - 1]), 
+            outTangentType, 
+            change
+        )
+    
+    # register undo
+    def undo():
+        change.undoIt()
+        modifier.undoIt()
+        
+    def redo():
+        modifier.doIt()
+        change.redoIt()
+        
+    registerUndo(undo, redo)
+        
 
 # ----------------------------------------------------------------------------
 
@@ -332,19 +689,17 @@ def applyEulerFilter(transform):
     :param str transform: Path to transform
     """
     # get anim curves connected to the rotate attributes
-    rotationCurves = []
-    for channel in CHANNELS: 
-        # variables
-        node = "{0}.rotate{1}".format(transform, channel)
-        
-        # get connected animation curve
-        rotationCurves.extend(
-            cmds.listConnections(
-                node, 
-                type="animCurve",
-                destination=False
-            ) or []
-        )
+    rotationCurves = cmds.listConnections(
+        [
+            "{0}.rotate{1}".format(transform, channel) 
+            for channel in CHANNELS
+        ],
+        type="animCurve",
+        destination=False
+    ) or []
+    
+    # remove duplicate curves
+    rotationCurves = list(dict.fromkeys(rotationCurves))
         
     # apply euler filter
     if rotationCurves: